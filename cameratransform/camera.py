@@ -20,7 +20,6 @@
 import numpy as np
 import os
 import json
-import itertools
 from scipy import stats
 from .parameter_set import ParameterSet, ClassWithParameterSet, Parameter, TYPE_GPS
 from .projection import RectilinearProjection, EquirectangularProjection, CylindricalProjection, CameraProjection
@@ -183,9 +182,8 @@ class CameraGroup(ClassWithParameterSet):
             if len(parameter_list) == 1:
                 params.update(parameter_list[0].parameters.parameters)
             else:
-                for index, proj in enumerate(parameter_list):
-                    for name in proj.parameters.parameters:
-                        params["C%d_%s" % (index, name)] = proj.parameters.parameters[name]
+                params.update({"C%d_%s" % (index, name): parameter for index, obj in enumerate(parameter_list)
+                               for name, parameter in obj.parameters.parameters.items()})
 
         gatherParameters(self.projection_list)
         gatherParameters(self.orientation_list)
@@ -193,21 +191,31 @@ class CameraGroup(ClassWithParameterSet):
 
         self.parameters = ParameterSet(**params)
 
-        self.cameras = [Camera(projection, orientation, lens) for index, projection, orientation, lens in
-                        zip(range(self.N), itertools.cycle(self.projection_list), itertools.cycle(self.orientation_list), itertools.cycle(self.lens_list))]
+        # lists that are shorter than the number of cameras are repeated
+        projection_count, orientation_count, lens_count = len(self.projection_list), len(self.orientation_list), len(self.lens_list)
+        self.cameras = [Camera(self.projection_list[index % projection_count], self.orientation_list[index % orientation_count],
+                               self.lens_list[index % lens_count]) for index in range(self.N)]
 
     def getBaseline(self):
         return np.sqrt((self[0].pos_x_m-self[1].pos_x_m)**2 + (self[0].pos_y_m-self[1].pos_y_m)**2)
 
+    def _getRays(self, points1, points2, normed=False):
+        cameras = self.cameras[:2]
+        # get the rays in the camera coordinates of both cameras
+        rays = np.stack([cam._getCameraRay(points, normed=normed) for cam, points in zip(cameras, [points1, points2])])
+        # and rotate them to the space coordinates with one batched matrix multiplication
+        rotations = np.stack([cam.orientation.R for cam in cameras])
+        return np.matmul(rays.reshape(2, -1, 3), rotations).reshape(rays.shape)
+
     def spaceFromImages(self, points1, points2):
-        p1, v1 = self.cameras[0].getRay(points1)
-        p2, v2 = self.cameras[1].getRay(points2)
-        return ray.intersectionOfTwoLines(p1, v1, p2, v2)
+        directions = self._getRays(points1, points2)
+        # the origins of the rays are the camera positions
+        return ray.intersectionOfTwoLines(self.cameras[0].orientation.t, directions[0], self.cameras[1].orientation.t, directions[1])
 
     def discanteBetweenRays(self, points1, points2):
-        p1, v1 = self.cameras[0].getRay(points1, normed=True)
-        p2, v2 = self.cameras[1].getRay(points2, normed=True)
-        return ray.distanceOfTwoLines(p1, v1, p2, v2)
+        directions = self._getRays(points1, points2, normed=True)
+        # the origins of the rays are the camera positions
+        return ray.distanceOfTwoLines(self.cameras[0].orientation.t, directions[0], self.cameras[1].orientation.t, directions[1])
 
     def imagesFromSpace(self, points):
         return [cam.imageFromSpace(points) for cam in self.cameras]
@@ -413,6 +421,8 @@ class Camera(ClassWithParameterSet):
     a lens distortion (subclass of :py:class:`LensDistortion`).
     """
     map = None
+    map_fixed_point = None
+    last_map_key = None
     last_extent = None
     last_scaling = None
 
@@ -821,16 +831,15 @@ class Camera(ClassWithParameterSet):
             the border of the image in **space** coordinates, dimensions (Nx3)
         """
         w, h = self.projection.parameters.image_width_px, self.projection.parameters.image_height_px
-        border = []
-        for y in np.arange(0, h, resolution):
-            border.append([0, y])
-        for x in np.arange(0, w, resolution):
-            border.append([x, h])
-        for y in np.arange(h, 0, -resolution):
-            border.append([w, y])
-        for x in np.arange(w, 0, -resolution):
-            border.append([x, 0])
-        return np.array(border)
+        # the four edges of the image (left, bottom, right, top)
+        y_up = np.arange(0, h, resolution)
+        x_up = np.arange(0, w, resolution)
+        y_down = np.arange(h, 0, -resolution)
+        x_down = np.arange(w, 0, -resolution)
+        return np.concatenate([np.stack([np.full(y_up.shape, 0), y_up], axis=1),
+                               np.stack([x_up, np.full(x_up.shape, h)], axis=1),
+                               np.stack([np.full(y_down.shape, w), y_down], axis=1),
+                               np.stack([x_down, np.full(x_down.shape, 0)], axis=1)], axis=0)
 
     def getCameraCone(self, project_to_ground=False, D=1):
         """
@@ -844,37 +853,20 @@ class Camera(ClassWithParameterSet):
         """
         w, h = self.projection.parameters.image_width_px, self.projection.parameters.image_height_px
         if project_to_ground:
-            border = []
-            corner_indices = [0]
-            for y in range(h):
-                border.append([0, y])
-            corner_indices.append(len(border))
-            for x in range(w):
-                border.append([x, h])
-            corner_indices.append(len(border))
-            for y in np.arange(h, 0, -1):
-                border.append([w, y])
-            corner_indices.append(len(border))
-            for x in np.arange(w, 0, -1):
-                border.append([x, 0])
-            corner_indices.append(len(border))
-            border = list(self.spaceFromImage(border, Z=0))
+            # the four edges of the image (left, bottom, right, top)
+            edges = [np.stack([np.full(h, 0), np.arange(h)], axis=1),
+                     np.stack([np.arange(w), np.full(w, h)], axis=1),
+                     np.stack([np.full(h, w), np.arange(h, 0, -1)], axis=1),
+                     np.stack([np.arange(w, 0, -1), np.full(w, 0)], axis=1)]
+            corner_indices = np.cumsum([0] + [len(edge) for edge in edges])
+            border = list(self.spaceFromImage(np.concatenate(edges, axis=0), Z=0))
         else:
-            border = []
-            corner_indices = [0]
-            border.append([0, h])
-            corner_indices.append(len(border))
-            border.append([w, h])
-            corner_indices.append(len(border))
-            border.append([w, 0])
-            corner_indices.append(len(border))
-            border.append([0, 0])
-            corner_indices.append(len(border))
-            border.append([0, h])
-            corner_indices.append(len(border))
-            border = list(self.spaceFromImage(border, D=D))
-
-        origin = self.orientation.spaceFromCamera([0, 0, 0])
+            corners = np.array([[0, h], [w, h], [w, 0], [0, 0], [0, h]])
+            corner_indices = np.arange(len(corners) + 1)
+            border = list(self.spaceFromImage(corners, D=D))
+
+        # the origin of the camera is the (cached) translation of the orientation
+        origin = self.orientation.t
         for corner_index in corner_indices:
             border.append([np.nan, np.nan, np.nan])
             border.append(origin)
@@ -893,7 +885,7 @@ class Camera(ClassWithParameterSet):
         Returns
         -------
         points : ndarray
-            the points in the **image** coordinate system, dimensions (2), (Nx2)
+            the points in the **image** coordinate system, dimensions (2), (Nx2), always of double precision
 
         Examples
         --------
@@ -914,9 +906,14 @@ class Camera(ClassWithParameterSet):
          [1652.73 2144.53]]
         """
         # ensure that the points are provided as an array
-        points = np.array(points)
-        # project the points from the space to the camera and from the camera to the image
-        return self.lens.distortedFromImage(self.projection.imageFromCamera(self.orientation.cameraFromSpace(points), hide_backpoints=hide_backpoints))
+        points = np.asarray(points)
+        # use the compiled kernel of the projection if available
+        image_points = self.projection._imageFromSpaceCompiled(points, self.orientation.R, self.orientation.t, hide_backpoints=hide_backpoints)
+        if image_points is None:
+            # project the points from the space to the camera and from the camera to the image
+            image_points = self.projection.imageFromCamera(self.orientation.cameraFromSpace(points), hide_backpoints=hide_backpoints)
+        # apply the lens distortion
+        return self.lens.distortedFromImage(image_points)
 
     def getRay(self, points, normed=False):
         """
@@ -959,16 +956,20 @@ class Camera(ClassWithParameterSet):
         [[-0.09 0.97 -0.35]
          [-0.18 0.98 -0.33]]
         """
-        # ensure that the points are provided as an array
-        points = np.array(points)
-        # get the camera position in space (the origin of the camera coordinate system)
-        offset = self.orientation.spaceFromCamera([0, 0, 0])
+        # get the camera position in space (the origin of the camera coordinate system), which the orientation caches
+        offset = self.orientation.t.copy()
         # get the direction fo the ray from the points
-        # the projection provides the ray in camera coordinates, which we convert to the space coordinates
-        direction = self.orientation.spaceFromCamera(self.projection.getRay(self.lens.imageFromDistorted(points), normed=normed), direction=True)
+        # the ray is provided in camera coordinates, which we convert to the space coordinates
+        direction = self.orientation.spaceFromCamera(self._getCameraRay(points, normed=normed), direction=True)
         # return the offset point and the direction of the ray
         return offset, direction
 
+    def _getCameraRay(self, points, normed=False):
+        # ensure that the points are provided as an array
+        points = np.asarray(points)
+        # the projection provides the ray of the undistorted points in camera coordinates
+        return self.projection.getRay(self.lens.imageFromDistorted(points), normed=normed)
+
     def spaceFromImage(self, points, X=None, Y=None, Z=0, D=None, mesh=None):
         """
         Convert points (Nx2) from the **image** coordinate system to the **space** coordinate system. This is not a unique
@@ -1032,7 +1033,7 @@ class Camera(ClassWithParameterSet):
          [-8.09 45.00 0.37]]
         """
         # ensure that the points are provided as an array
-        points = np.array(points)
+        points = np.asarray(points)
         # get the index which coordinate to force to the given value
         given = np.array([X, Y, Z], dtype=object)
         if X is not None:
@@ -1059,15 +1060,12 @@ class Camera(ClassWithParameterSet):
             # solve the line equation for the factor (how many times the direction vector needs to be added to the origin point)
             factor = (given[index] - offset[..., index]) / direction[..., index]
 
-        if not isinstance(factor, np.ndarray):
-            # if factor is not an array, we don't need to specify the broadcasting
-            points = direction * factor + offset
-        else:
-            # apply the factor to the direction vector plus the offset
-            points = direction * factor[:, None] + offset[None, :]
+        # ensure that the factor is an array, so that scalars and arrays can be broadcast in the same way
+        factor = np.asarray(factor, dtype=direction.dtype)
+        # apply the factor to the direction vector plus the offset
+        points = direction * factor[..., None] + offset
         # ignore points that are behind the camera (e.g. trying to project points above the horizon to the ground)
-        points[factor < 0] = np.nan
-        return points
+        return np.where((factor < 0)[..., None], np.nan, points)
 
     def gpsFromSpace(self, points):
         """
@@ -1202,18 +1200,20 @@ class Camera(ClassWithParameterSet):
                 self.last_scaling_undistort == scaling:
             return self.map_undistort
 
-        # get a mesh grid
-        mesh = np.array(np.meshgrid(np.arange(extent[0], extent[1], scaling),
-                                    np.arange(extent[2], extent[3], scaling)))
+        # get the coordinates of the grid, the rows are ordered from top to bottom
+        xs = np.arange(extent[0], extent[1], scaling)
+        ys = np.arange(extent[2], extent[3], scaling)[::-1]
 
-        # convert it to a list of points Nx2
-        mesh_points = mesh.reshape(2, mesh.shape[1] * mesh.shape[2]).T
+        # fill a list of points Nx2 with the grid
+        mesh_points = np.empty((ys.size * xs.size, 2))
+        mesh_points[:, 0] = np.tile(xs, ys.size)
+        mesh_points[:, 1] = np.repeat(ys, xs.size)
 
         # transform the space points to the image
         mesh_points_shape = self.lens.distortedFromImage(mesh_points)
 
         # reshape the map and cache it
-        self.map_undistort = mesh_points_shape.T.reshape(mesh.shape).astype(np.float32)[:, ::-1, :]
+        self.map_undistort = mesh_points_shape.reshape(ys.size, xs.size, 2).transpose(2, 0, 1).astype(np.float32, order="C")
 
         self.last_extent_undistort = extent
         self.last_scaling_undistort = scaling
@@ -1260,7 +1260,10 @@ class Camera(ClassWithParameterSet):
         if len(image.shape) == 2:
             pass
         elif image.shape[2] == 3:
-            image = np.dstack((image, np.ones(shape=(image.shape[0], image.shape[1], 1), dtype="uint8") * 255))
+            image_rgba = np.empty(image.shape[:2] + (4,), dtype=np.result_type(image.dtype, np.uint8))
+            image_rgba[..., :3] = image
+            image_rgba[..., 3] = 255
+            image = image_rgba
         image = cv2.remap(image, x, y,
                           interpolation=cv2.INTER_NEAREST,
                           borderValue=[0, 1, 0, 0])[::-1]  # , borderMode=cv2.BORDER_TRANSPARENT)
@@ -1278,10 +1281,10 @@ class Camera(ClassWithParameterSet):
             extent = [np.nanmin(border[:, 0]), np.nanmax(border[:, 0]),
                       np.nanmin(border[:, 1]), np.nanmax(border[:, 1])]
 
-        # if we have cached the map, use the cached map
-        if self.map is not None and \
-                all(self.last_extent == np.array(extent)) and \
-                (self.last_scaling == scaling):
+        # if we have cached the map, use the cached map (the key is a tuple of the arguments to compare it in one go)
+        extent = tuple(float(value) for value in extent)
+        map_key = (extent, scaling, Z, hide_backpoints)
+        if self.map is not None and self.last_map_key == map_key:
             return self.map
 
         # if no scaling is given, scale so that the resulting image has an equal amount of pixels as the original image
@@ -1289,20 +1292,34 @@ class Camera(ClassWithParameterSet):
             scaling = np.sqrt((extent[1] - extent[0]) * (extent[3] - extent[2])) / \
                       np.sqrt((self.projection.parameters.image_width_px * self.projection.parameters.image_height_px))
 
-        # get a mesh grid
-        mesh = np.array(np.meshgrid(np.arange(extent[0], extent[1], scaling),
-                                    np.arange(extent[2], extent[3], scaling)))
-
-        # convert it to a list of points Nx2
-        mesh_points = mesh.reshape(2, mesh.shape[1] * mesh.shape[2]).T
-        mesh_points = np.hstack((mesh_points, Z*np.ones((mesh_points.shape[0], 1))))
-
-        # transform the space points to the image
-        mesh_points_shape = self.imageFromSpace(mesh_points, hide_backpoints=hide_backpoints)
-
-        # reshape the map and cache it
-        self.map = mesh_points_shape.T.reshape(mesh.shape).astype(np.float32)[:, ::-1, :]
+        # get the coordinates of the grid, the rows are ordered from top to bottom
+        xs = np.arange(extent[0], extent[1], scaling)
+        ys = np.arange(extent[2], extent[3], scaling)[::-1]
 
+        # use the compiled kernel of the projection if available (it does not include the lens distortion)
+        image_map = None
+        if isinstance(self.lens, NoDistortion):
+            image_map = self.projection._mapFromSpaceCompiled(xs, ys, Z, self.orientation.R, self.orientation.t,
+                                                              hide_backpoints=hide_backpoints)
+        if image_map is None:
+            # fill a list of points Nx3 with the grid at the height Z
+            mesh_points = np.empty((ys.size * xs.size, 3))
+            mesh_points[:, 0] = np.tile(xs, ys.size)
+            mesh_points[:, 1] = np.repeat(ys, xs.size)
+            mesh_points[:, 2] = Z
+
+            # transform the space points to the image
+            mesh_points_shape = self.imageFromSpace(mesh_points, hide_backpoints=hide_backpoints)
+
+            # reshape the map
+            image_map = mesh_points_shape.reshape(ys.size, xs.size, 2).transpose(2, 0, 1).astype(np.float32, order="C")
+
+        # cache the map
+        self.map = image_map
+        # the fixed point version of the map has to be converted again
+        self.map_fixed_point = None
+
+        self.last_map_key = map_key
         self.last_extent = extent
         self.last_scaling = scaling
 
@@ -1349,12 +1366,19 @@ class Camera(ClassWithParameterSet):
             assert image.shape[0] == self.image_height_px, "The height of the image (%d) does not match the image height of the camera (%d)." % (image.shape[0], self.image_height_px)
         # get the mapping
         x, y = self._getMap(extent=extent, scaling=scaling, Z=Z, hide_backpoints=hide_backpoints)
+        # convert the map to the more compact fixed point format of cv2 and cache it with the map
+        if self.map_fixed_point is None:
+            self.map_fixed_point = cv2.convertMaps(x, y, cv2.CV_16SC2, nninterpolation=True)
+        map1, map2 = self.map_fixed_point
         # ensure that the image has an alpha channel (to enable alpha for the points outside the image)
         if len(image.shape) == 2:
             pass
         elif image.shape[2] == 3:
-            image = np.dstack((image, np.ones(shape=(image.shape[0], image.shape[1], 1), dtype="uint8") * 255))
-        image = cv2.remap(image, x, y,
+            image_rgba = np.empty(image.shape[:2] + (4,), dtype=np.result_type(image.dtype, np.uint8))
+            image_rgba[..., :3] = image
+            image_rgba[..., 3] = 255
+            image = image_rgba
+        image = cv2.remap(image, map1, map2,
                           interpolation=cv2.INTER_NEAREST,
                           borderValue=[0, 1, 0, 0])  # , borderMode=cv2.BORDER_TRANSPARENT)
         if do_plot:
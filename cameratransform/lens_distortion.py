@@ -151,7 +151,7 @@ class BrownLensDistortion(LensDistortion):
     def imageFromDistorted(self, points):
         # ensure that the points are provided as an array
         # and rescale the points to that the center is at 0 and the border at 1
-        points = (np.array(points)-self.offset)/self.scale
+        points = (np.asarray(points)-self.offset)/self.scale
         # calculate the radius from the center
         r = np.linalg.norm(points, axis=-1)[..., None]
         # transform the points
@@ -162,7 +162,7 @@ class BrownLensDistortion(LensDistortion):
     def distortedFromImage(self, points):
         # ensure that the points are provided as an array
         # and rescale the points to that the center is at 0 and the border at 1
-        points = (np.array(points)-self.offset)/self.scale
+        points = (np.asarray(points)-self.offset)/self.scale
         # calculate the radius from the center
         r = np.linalg.norm(points, axis=-1)[..., None]
         # transform the points
@@ -243,7 +243,7 @@ class ABCDistortion(LensDistortion):
     def imageFromDistorted(self, points):
         # ensure that the points are provided as an array
         # and rescale the points to that the center is at 0 and the border at 1
-        points = (np.array(points)-self.offset)/self.scale
+        points = (np.asarray(points)-self.offset)/self.scale
         # calculate the radius form the center
         r = np.linalg.norm(points, axis=-1)[..., None]
         # transform the points
@@ -254,7 +254,7 @@ class ABCDistortion(LensDistortion):
     def distortedFromImage(self, points):
         # ensure that the points are provided as an array
         # and rescale the points to that the center is at 0 and the border at 1
-        points = (np.array(points)-self.offset)/self.scale
+        points = (np.asarray(points)-self.offset)/self.scale
         # calculate the radius form the center
         r = np.linalg.norm(points, axis=-1)[..., None]
         # transform the points
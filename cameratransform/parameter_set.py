@@ -133,18 +133,26 @@ class ParameterSet(object):
 
     def set_fit_parameters(self, names, values=None):
         if isinstance(names, dict):
-            iterator = names.items()
-        else:
-            iterator = zip(names, values)
-        callbacks = set()
-        for n, v in iterator:
-            if n in self.parameters:
-                self.parameters[n].value = v
-                self.parameters[n].state = STATE_FIT
-                if self.parameters[n].callback is not None:
-                    callbacks.add(self.parameters[n].callback)
-        for call in callbacks:
-            call()
+            names, values = names.keys(), names.values()
+        self.get_fit_parameter_setter(names)(values)
+
+    def get_fit_parameter_setter(self, names):
+        # look up the parameters and their callbacks only once, e.g. for the cost function of a fit
+        parameter_objs = [self.parameters.get(n) for n in names]
+        callbacks = []
+        for parameter_obj in parameter_objs:
+            if parameter_obj is not None and parameter_obj.callback is not None and parameter_obj.callback not in callbacks:
+                callbacks.append(parameter_obj.callback)
+
+        def set_fit_parameters(values):
+            for parameter_obj, v in zip(parameter_objs, values):
+                if parameter_obj is not None:
+                    parameter_obj.value = v
+                    parameter_obj.state = STATE_FIT
+            for call in callbacks:
+                call()
+
+        return set_fit_parameters
 
     def get_parameter_defaults(self, names):
         return [self.parameters[n].default for n in names]
@@ -252,8 +260,10 @@ class ClassWithParameterSet(object):
             estimates.append(param.value[()])
             ranges.append([param.parents.get("lower"), param.parents.get("upper")])
 
+        set_fit_parameters = self.parameters.get_fit_parameter_setter(names)
+
         def getLogProb(position):
-            self.parameters.set_fit_parameters(names, position)
+            set_fit_parameters(position)
             return self.getLogProbability()#{n: p for n, p in zip(parameter_names, position)})
 
         trys = 0
@@ -272,11 +282,11 @@ class ClassWithParameterSet(object):
             del kwargs["iterations"]
 
         def cost(p):
-            self.parameters.set_fit_parameters(names, p)
+            set_fit_parameters(p)
             return -self.getLogProbability()
 
         p = minimize(cost, estimates, bounds=ranges, **kwargs)
-        self.parameters.set_fit_parameters(names, p["x"])
+        set_fit_parameters(p["x"])
         return p
 
     def metropolis(self, parameter, step=1, iterations=1e5, burn=0.1, disable_bar=False, print_trace=True):
@@ -295,8 +305,10 @@ class ClassWithParameterSet(object):
         start = np.array(start)
         step = step*np.array([p.step for p in parameter])
 
+        set_fit_parameters = self.parameters.get_fit_parameter_setter(parameter_names)
+
         def getLogProb(position):
-            self.parameters.set_fit_parameters(parameter_names, position[:len(parameter_names)])
+            set_fit_parameters(position[:len(parameter_names)])
             for param, value in zip(self.additional_parameters, position[len(parameter_names):]):
                 param.set_value(value)
             return self.getLogProbability()
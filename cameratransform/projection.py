@@ -261,6 +261,29 @@ class CameraProjection(ClassWithParameterSet):
         # to be overloaded by the child class.
         return None
 
+    # whether to use the compiled numba kernels, they run in parallel threads and are therefore only used if enabled
+    use_compiled_kernels = False
+
+    def _imageFromSpaceCompiled(self, points, R, t, hide_backpoints=True):
+        """
+        Convert points (Nx3) from the **space** coordinate system directly to the **image** coordinate system, using
+        the rotation R and translation t of the orientation. This is an optional fused implementation of
+        imageFromCamera(cameraFromSpace(points)), which is only available if use_compiled_kernels is enabled, numba is
+        installed and the projection provides a compiled kernel. Returns None if no compiled kernel is available.
+        """
+        # to be overloaded by the child class.
+        return None
+
+    def _mapFromSpaceCompiled(self, xs, ys, Z, R, t, hide_backpoints=True):
+        """
+        Calculate the top view map (2 x len(ys) x len(xs), float32) of the grid of the x coordinates xs and the y
+        coordinates ys in the **space** coordinate system at the height Z, in one fused pass. The rows of the map follow
+        the order of ys. This is only available if use_compiled_kernels is enabled, numba is installed and the projection
+        provides a compiled kernel. Returns None if no compiled kernel is available.
+        """
+        # to be overloaded by the child class.
+        return None
+
     def getFieldOfView(self):  # pragma: no cover
         """
         The field of view of the projection in x (width, horizontal) and y (height, vertical) direction.
@@ -314,6 +337,48 @@ class CameraProjection(ClassWithParameterSet):
         return 0
 
 
+def _compileRectilinearKernels():
+    """
+    Compile the numba kernels to transform points from the space directly to the image and to calculate the top view
+    map for the rectilinear projection. Returns None if numba is not available.
+    """
+    try:
+        import numba
+    except ImportError:
+        return None
+
+    @numba.njit(inline="always")
+    def rectilinearImageFromTranslated(x, y, z, R, f_x, f_y, c_x, c_y, hide_backpoints):
+        # rotate the point (already translated to the camera origin) to the camera coordinate system
+        cz = R[2, 0] * x + R[2, 1] * y + R[2, 2] * z
+        # points with small z distances (and points behind the camera if desired) cannot be projected
+        if abs(cz) < 1e-10 or (hide_backpoints and cz > 0):
+            return np.nan, np.nan
+        cx = R[0, 0] * x + R[0, 1] * y + R[0, 2] * z
+        cy = R[1, 0] * x + R[1, 1] * y + R[1, 2] * z
+        # project the point to the image
+        return -f_x * cx / cz + c_x, f_y * cy / cz + c_y
+
+    @numba.njit(parallel=True, cache=True)
+    def rectilinearImageFromSpace(points, R, t, f_x, f_y, c_x, c_y, hide_backpoints, out):
+        for i in numba.prange(points.shape[0]):
+            # translate the point to the camera origin and project it
+            out[i, 0], out[i, 1] = rectilinearImageFromTranslated(points[i, 0] - t[0], points[i, 1] - t[1], points[i, 2] - t[2],
+                                                                  R, f_x, f_y, c_x, c_y, hide_backpoints)
+
+    @numba.njit(parallel=True, cache=True)
+    def rectilinearMapFromSpace(xs, ys, Z, R, t, f_x, f_y, c_x, c_y, hide_backpoints, out):
+        for j in numba.prange(ys.shape[0]):
+            # translate the grid to the camera origin
+            y = ys[j] - t[1]
+            z = Z - t[2]
+            for i in range(xs.shape[0]):
+                out[0, j, i], out[1, j, i] = rectilinearImageFromTranslated(xs[i] - t[0], y, z,
+                                                                            R, f_x, f_y, c_x, c_y, hide_backpoints)
+
+    return rectilinearImageFromSpace, rectilinearMapFromSpace
+
+
 class RectilinearProjection(CameraProjection):
     r"""
     This projection is the standard "pin-hole", or frame camera model, which is the most common projection for single images. The angles
@@ -350,17 +415,22 @@ class RectilinearProjection(CameraProjection):
     """
 
     def getRay(self, points, normed=False):
-        # ensure that the points are provided as an array
-        points = np.array(points)
-        # set z=focallenth and solve the other equations for x and y
-        ray = np.array([-(points[..., 0] - self.center_x_px) / self.focallength_x_px,
-                        (points[..., 1] - self.center_y_px) / self.focallength_y_px,
-                        np.ones(points[..., 1].shape)]).T
+        # ensure that the points are provided as an array of floats (integer points would wrap around when subtracted)
+        points = np.asarray(points)
+        if not np.issubdtype(points.dtype, np.floating):
+            points = points.astype(np.float64)
+        f_x, f_y, c_x, c_y = self.focallength_x_px, self.focallength_y_px, self.center_x_px, self.center_y_px
+        # set z=focallenth and solve the other equations for x and y (the ray points in negative z direction)
+        x = (points[..., 0] - c_x) / f_x
+        y = (c_y - points[..., 1]) / f_y
+        z = np.full_like(x, -1)
+        # compose the ray
+        ray = np.stack([x, y, z], axis=-1)
         # norm the ray if desired
         if normed:
-            ray /= np.linalg.norm(ray, axis=-1)[..., None]
+            ray /= np.linalg.norm(ray, axis=-1, keepdims=True)
         # return the ray
-        return -ray
+        return ray
 
     def imageFromCamera(self, points, hide_backpoints=True):
         """
@@ -368,16 +438,66 @@ class RectilinearProjection(CameraProjection):
             x_im = f_x * --- + offset_x      y_im = f_y * --- + offset_y
                           z                                z
         """
-        points = np.array(points)
-        # set small z distances to 0
-        points[np.abs(points[..., 2]) < 1e-10] = 0
-        # transform the points
-        transformed_points = np.array([-points[..., 0] * self.focallength_x_px / points[..., 2] + self.center_x_px,
-                                       points[..., 1] * self.focallength_y_px / points[..., 2] + self.center_y_px]).T
+        points = np.asarray(points)
+        f_x, f_y, c_x, c_y = self.focallength_x_px, self.focallength_y_px, self.center_x_px, self.center_y_px
+        # keep single precision input in single precision
+        dtype = np.result_type(points.dtype, np.float32)
+        z = points[..., 2]
+        # points with small z distances (and points behind the camera if desired) cannot be projected
+        invalid = np.abs(z) < 1e-10
         if hide_backpoints:
-            transformed_points[points[..., 2] > 0] = np.nan
+            invalid |= z > 0
+        # compute 1/z only once and leave it nan for the invalid points
+        inv_z = np.divide(1, z, out=np.full(z.shape, np.nan, dtype=dtype), where=~invalid)
+        # transform the points
+        transformed_points = np.empty(z.shape + (2,), dtype=dtype)
+        np.multiply(points[..., 0], inv_z, out=transformed_points[..., 0])
+        np.multiply(points[..., 1], inv_z, out=transformed_points[..., 1])
+        transformed_points *= [-f_x, f_y]
+        transformed_points += [c_x, c_y]
         return transformed_points
 
+    # the compiled kernels are shared by all instances, False if they are not available
+    _kernels = None
+
+    def _getCompiledKernels(self):
+        # the compiled kernels have to be enabled
+        if not self.use_compiled_kernels:
+            return None
+        # compile the kernels on the first call
+        if RectilinearProjection._kernels is None:
+            RectilinearProjection._kernels = _compileRectilinearKernels() or False
+        return RectilinearProjection._kernels or None
+
+    def _imageFromSpaceCompiled(self, points, R, t, hide_backpoints=True):
+        kernels = self._getCompiledKernels()
+        if kernels is None:
+            return None
+        # ensure that the points are provided as a list of points (Nx3) of double precision, like the numpy path which
+        # subtracts the double precision translation
+        points = np.asarray(points)
+        flat_points = np.ascontiguousarray(points.reshape(-1, 3), dtype=np.float64)
+        transformed_points = np.empty((flat_points.shape[0], 2), dtype=np.float64)
+        kernels[0](flat_points, np.ascontiguousarray(R, dtype=np.float64), np.asarray(t, dtype=np.float64),
+                   float(self.focallength_x_px), float(self.focallength_y_px),
+                   float(self.center_x_px), float(self.center_y_px),
+                   bool(hide_backpoints), transformed_points)
+        return transformed_points.reshape(points.shape[:-1] + (2,))
+
+    def _mapFromSpaceCompiled(self, xs, ys, Z, R, t, hide_backpoints=True):
+        kernels = self._getCompiledKernels()
+        if kernels is None:
+            return None
+        xs = np.ascontiguousarray(xs, dtype=np.float64)
+        ys = np.ascontiguousarray(ys, dtype=np.float64)
+        image_map = np.empty((2, ys.shape[0], xs.shape[0]), dtype=np.float32)
+        kernels[1](xs, ys, float(Z),
+                   np.ascontiguousarray(R, dtype=np.float64), np.asarray(t, dtype=np.float64),
+                   float(self.focallength_x_px), float(self.focallength_y_px),
+                   float(self.center_x_px), float(self.center_y_px),
+                   bool(hide_backpoints), image_map)
+        return image_map
+
     def getFieldOfView(self):
         return np.rad2deg(2 * np.arctan(self.image_width_px / (2 * self.focallength_x_px))), \
                np.rad2deg(2 * np.arctan(self.image_height_px / (2 * self.focallength_y_px)))
@@ -420,21 +540,24 @@ class CylindricalProjection(CameraProjection):
     """
 
     def getRay(self, points, normed=False):
-        # ensure that the points are provided as an array
-        points = np.array(points)
-        # set r=1 and solve the other equations for x and y
+        # ensure that the points are provided as an array of floats (integer points would wrap around when subtracted)
+        points = np.asarray(points)
+        if not np.issubdtype(points.dtype, np.floating):
+            points = points.astype(np.float64)
+        f_x, f_y, c_x, c_y = self.focallength_x_px, self.focallength_y_px, self.center_x_px, self.center_y_px
+        # set r=1 and solve the other equations for x and y (the ray points in negative z direction)
         r = 1
-        alpha = (points[..., 0] - self.center_x_px) / self.focallength_x_px
-        x = -np.sin(alpha) * r
-        z = np.cos(alpha) * r
-        y = r * (points[..., 1] - self.center_y_px) / self.focallength_y_px
+        alpha = (points[..., 0] - c_x) / f_x
+        x = np.sin(alpha) * r
+        z = -np.cos(alpha) * r
+        y = r * (c_y - points[..., 1]) / f_y
         # compose the ray
-        ray = np.array([x, y, z]).T
+        ray = np.stack([x, y, z], axis=-1)
         # norm the ray if desired
         if normed:
-            ray /= np.linalg.norm(ray, axis=-1)[..., None]
-        # return the rey
-        return -ray
+            ray /= np.linalg.norm(ray, axis=-1, keepdims=True)
+        # return the ray
+        return ray
 
     def imageFromCamera(self, points, hide_backpoints=True):
         """
@@ -443,18 +566,18 @@ class CylindricalProjection(CameraProjection):
                                ( z )                              sqrt(x**2+z**2)
         """
         # ensure that the points are provided as an array
-        points = np.array(points)
+        points = np.asarray(points)
+        f_x, f_y, c_x, c_y = self.focallength_x_px, self.focallength_y_px, self.center_x_px, self.center_y_px
         # set small z distances to 0
-        points[np.abs(points[..., 2]) < 1e-10] = 0
+        points = np.where((np.abs(points[..., 2]) < 1e-10)[..., None], 0, points)
+        # the distance from the y axis
+        r = np.sqrt(points[..., 0] * points[..., 0] + points[..., 2] * points[..., 2])
         # transform the points
-        transformed_points = np.array(
-            [-self.focallength_x_px * np.arctan2(-points[..., 0], -points[..., 2]) + self.center_x_px,
-             -self.focallength_y_px * points[..., 1] / np.linalg.norm(points[..., [0, 2]],
-                                                                      axis=-1) + self.center_y_px]).T
+        transformed_points = np.stack(
+            [-f_x * np.arctan2(-points[..., 0], -points[..., 2]) + c_x,
+             -f_y * points[..., 1] / r + c_y], axis=-1)
         # ensure that points' x values are also nan when the y values are nan
-        transformed_points[np.isnan(transformed_points[..., 1])] = np.nan
-        # return the points
-        return transformed_points
+        return np.where(np.isnan(transformed_points[..., 1])[..., None], np.nan, transformed_points)
 
     def getFieldOfView(self):
         return np.rad2deg(self.image_width_px / self.focallength_x_px), \
@@ -497,21 +620,24 @@ class EquirectangularProjection(CameraProjection):
     """
 
     def getRay(self, points, normed=False):
-        # ensure that the points are provided as an array
-        points = np.array(points)
-        # set r=1 and solve the other equations for x and y
+        # ensure that the points are provided as an array of floats (integer points would wrap around when subtracted)
+        points = np.asarray(points)
+        if not np.issubdtype(points.dtype, np.floating):
+            points = points.astype(np.float64)
+        f_x, f_y, c_x, c_y = self.focallength_x_px, self.focallength_y_px, self.center_x_px, self.center_y_px
+        # set r=1 and solve the other equations for x and y (the ray points in negative z direction)
         r = 1
-        alpha = (points[..., 0] - self.center_x_px) / self.focallength_x_px
-        x = -np.sin(alpha) * r
-        z = np.cos(alpha) * r
-        y = r * np.tan((points[..., 1] - self.center_y_px) / self.focallength_y_px)
+        alpha = (points[..., 0] - c_x) / f_x
+        x = np.sin(alpha) * r
+        z = -np.cos(alpha) * r
+        y = r * np.tan((c_y - points[..., 1]) / f_y)
         # compose the ray
-        ray = np.array([x, y, z]).T
+        ray = np.stack([x, y, z], axis=-1)
         # norm the ray if desired
         if normed:
-            ray /= np.linalg.norm(ray, axis=-1)[..., None]
-        # return the rey
-        return -ray
+            ray /= np.linalg.norm(ray, axis=-1, keepdims=True)
+        # return the ray
+        return ray
 
     def imageFromCamera(self, points, hide_backpoints=True):
         """
@@ -520,14 +646,16 @@ class EquirectangularProjection(CameraProjection):
                                ( z )                                    (sqrt(x**2+z**2))
         """
         # ensure that the points are provided as an array
-        points = np.array(points)
+        points = np.asarray(points)
+        f_x, f_y, c_x, c_y = self.focallength_x_px, self.focallength_y_px, self.center_x_px, self.center_y_px
         # set small z distances to 0
-        points[np.abs(points[..., 2]) < 1e-10] = 0
+        points = np.where((np.abs(points[..., 2]) < 1e-10)[..., None], 0, points)
+        # the distance from the y axis
+        r = np.sqrt(points[..., 0] * points[..., 0] + points[..., 2] * points[..., 2])
         # transform the points
-        transformed_points = np.array(
-            [-self.focallength_x_px * np.arctan2(-points[..., 0], -points[..., 2]) + self.center_x_px,
-             -self.focallength_y_px * np.arctan2(points[..., 1], np.sqrt(
-                 points[..., 0] ** 2 + points[..., 2] ** 2)) + self.center_y_px]).T
+        transformed_points = np.stack(
+            [-f_x * np.arctan2(-points[..., 0], -points[..., 2]) + c_x,
+             -f_y * np.arctan2(points[..., 1], r) + c_y], axis=-1)
 
         # return the points
         return transformed_points
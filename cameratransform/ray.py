@@ -119,29 +119,22 @@ def intersectionOfTwoLines(p1, v1, p2, v2):
     Returns
     -------
     intersection : ndarray
-        the intersection point(s), or the point closes to the two lines if they do no intersect, dimensions: (3), (Nx3)
+        the intersection point(s), or the point closes to the two lines if they do no intersect, dimensions: (3), (Nx3).
+        Points have nan values when the lines are parallel.
     """
-    # if we transform multiple points in one go
-    if len(v1.shape) == 2:
-        a1 = np.einsum('ij,ij->i', v1, v1)
-        a2 = np.einsum('ij,ij->i', v1, v2)
-        b1 = -np.einsum('ij,ij->i', v2, v1)
-        b2 = -np.einsum('ij,ij->i', v2, v2)
-        c1 = -np.einsum('ij,j->i', v1, p1 - p2)
-        c2 = -np.einsum('ij,j->i', v2, p1 - p2)
-        res = np.linalg.solve(np.array([[a1, b1], [a2, b2]]).transpose(2, 0, 1), np.array([c1, c2]).T)
-        res = res[:, None, :]
-        return np.mean([p1 + res[..., 0] * v1, p2 + res[..., 1] * v2], axis=0)
-    else:  # or just one point
-        a1 = np.dot(v1, v1)
-        a2 = np.dot(v1, v2)
-        b1 = -np.dot(v2, v1)
-        b2 = -np.dot(v2, v2)
-        c1 = -np.dot(v1, p1 - p2)
-        c2 = -np.dot(v2, p1 - p2)
-        res = np.linalg.solve(np.array([[a1, b1], [a2, b2]]), np.array([c1, c2]))
-        res = res[None, None, :]
-        return np.mean([p1 + res[..., 0] * v1, p2 + res[..., 1] * v2], axis=0)[0]
+    d = p1 - p2
+    a1 = (v1 * v1).sum(-1)
+    a2 = (v1 * v2).sum(-1)
+    b1 = -a2
+    b2 = -(v2 * v2).sum(-1)
+    c1 = -(v1 * d).sum(-1)
+    c2 = -(v2 * d).sum(-1)
+    # solve the 2x2 system(s) with Cramer's rule, parallel lines have a zero determinant and result in nan
+    det = a1 * b2 - a2 * b1
+    s = np.divide(c1 * b2 - b1 * c2, det, out=np.full(np.shape(det), np.nan), where=det != 0)
+    t = np.divide(a1 * c2 - a2 * c1, det, out=np.full(np.shape(det), np.nan), where=det != 0)
+    # the factors are scalars for one point or (N) for multiple points
+    return 0.5 * (p1 + p2 + s[..., None] * v1 + t[..., None] * v2)
 
 
 def distanceOfTwoLines(p1, v1, p2, v2):
@@ -173,9 +166,11 @@ def distanceOfTwoLines(p1, v1, p2, v2):
         b2 = -np.einsum('ij,ij->i', v2, v2)
         c1 = -np.einsum('ij,j->i', v1, p1 - p2)
         c2 = -np.einsum('ij,j->i', v2, p1 - p2)
-        res = np.linalg.solve(np.array([[a1, b1], [a2, b2]]).transpose(2, 0, 1), np.array([c1, c2]).T)
-        res = res[:, None, :]
-        return np.linalg.norm((p1 + res[..., 0] * v1) - (p2 + res[..., 1] * v2), axis=1)
+        # stack the 2x2 systems directly as (N, 2, 2) and the right hand sides as (N, 2, 1)
+        A = np.stack((np.stack((a1, b1), axis=-1), np.stack((a2, b2), axis=-1)), axis=-2)
+        rhs = np.stack((c1, c2), axis=-1)[..., None]
+        res = np.linalg.solve(A, rhs)
+        return np.linalg.norm((p1 + res[:, 0] * v1) - (p2 + res[:, 1] * v2), axis=1)
     else:  # or just one point
         a1 = np.dot(v1, v1)
         a2 = np.dot(v1, v2)
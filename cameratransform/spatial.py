@@ -113,7 +113,7 @@ class SpatialOrientation(ClassWithParameterSet):
         heading = np.deg2rad(self.parameters.heading_deg)
 
         # get the translation matrix and rotate it
-        self.t = np.array([self.parameters.pos_x_m, self.parameters.pos_y_m, self.parameters.elevation_m])
+        self.t = np.array([self.parameters.pos_x_m, self.parameters.pos_y_m, self.parameters.elevation_m], dtype=float)
 
         # # construct the rotation matrices for tilt, roll and heading
         # # (original)
@@ -185,7 +185,7 @@ class SpatialOrientation(ClassWithParameterSet):
         [[0.09 0.97 15.04]
          [0.18 0.98 15.07]]
         """
-        points = np.array(points)
+        points = np.asarray(points)
         return np.dot(points - self.t, self.R.T)
 
 
@@ -222,7 +222,7 @@ class SpatialOrientation(ClassWithParameterSet):
         [[-0.09 -0.27 -1.00]
          [-0.18 -0.24 -1.00]]
         """
-        points = np.array(points)
+        points = np.asarray(points)
         if direction:
             return np.dot(points, self.R_inv.T)
         else:
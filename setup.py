@@ -34,6 +34,7 @@ setup(name='cameratransform',
       ],
       extras_require={
         'projecting_top_view':  ["cv2", "matplotlib"],
-        'exif_extraction':  ["pillow", "requests"]
+        'exif_extraction':  ["pillow", "requests"],
+        'compiled_projection':  ["numba"]
       }
       )
@@ -131,6 +131,17 @@ class TestParameterSet(unittest.TestCase):
         intersection = ct.ray.intersectionOfTwoLines(p1, v1, p2, v2)
         np.testing.assert_almost_equal(intersection, center, 1)
 
+    def test_intersectionOfParallelLines(self):
+        p1 = np.array([0., 0., 0.])
+        p2 = np.array([0., 1., 0.])
+        v = np.array([1., 0., 0.])
+        # parallel lines do not have a closest point, for a single point as for a batch of points
+        with np.errstate(all="raise"):
+            self.assertTrue(np.all(np.isnan(ct.ray.intersectionOfTwoLines(p1, v, p2, v))))
+            intersection = ct.ray.intersectionOfTwoLines(p1, np.array([v, [0., 0., 1.]]), p2, np.array([v, [1., 0., 0.]]))
+        self.assertTrue(np.all(np.isnan(intersection[0])))
+        np.testing.assert_almost_equal(intersection[1], [0, 0.5, 0])
+
     @given(st_np.arrays(dtype="float", shape=(4, 2), elements=st.floats(-100, 100)))
     def test_extrudeLine(self, line):
         mesh = ct.ray.extrudeLine(line, 0, 1)
@@ -24,6 +24,7 @@ import unittest
 import numpy as np
 import sys
 import os
+import importlib.util
 
 from hypothesis import given, reproduce_failure, assume, note, strategies as st
 from hypothesis.extra import numpy as st_np
@@ -199,6 +200,68 @@ class TestTransforms(unittest.TestCase):
         np.testing.assert_equal(np.isnan(p[..., :2]), np.isnan(p1),
                                 err_msg="Points behind the camera do not produce a nan value.")
 
+    @unittest.skipIf(importlib.util.find_spec("numba") is None, "numba is not installed")
+    def test_compiledImageFromSpace(self):
+        cam = ct.Camera(ct.RectilinearProjection(focallength_px=3729, image=(4608, 2592)),
+                        ct.SpatialOrientation(elevation_m=15.4, tilt_deg=85, heading_deg=20))
+        cam.projection.use_compiled_kernels = True
+        # points in front of the camera, behind the camera and in the plane of the camera (z=0 in camera coordinates)
+        p = np.array([[-4.17, 45.32, 0.], [-8.57, 47.91, 0.], [-4.17, -10.1, 0.], [0., 0., 0.]])
+        p[3] = cam.orientation.spaceFromCamera([1., 2., 0.])
+        for hide_backpoints in [True, False]:
+            # a single point, a list of points and an N-D array of points
+            for points in [p[0], p, np.array([p, p[::-1]])]:
+                expected = cam.projection.imageFromCamera(cam.orientation.cameraFromSpace(points), hide_backpoints=hide_backpoints)
+                compiled = cam.projection._imageFromSpaceCompiled(points, cam.orientation.R, cam.orientation.t, hide_backpoints=hide_backpoints)
+                self.assertEqual(compiled.shape, expected.shape)
+                np.testing.assert_allclose(compiled, expected, rtol=1e-10)
+                np.testing.assert_allclose(cam.imageFromSpace(points, hide_backpoints=hide_backpoints), expected, rtol=1e-10)
+        # single precision input results in double precision output, with and without the kernel
+        self.assertEqual(cam.imageFromSpace(p.astype(np.float32)).dtype, np.float64)
+        # the kernel is only used if it is enabled
+        cam.projection.use_compiled_kernels = False
+        self.assertEqual(cam.imageFromSpace(p.astype(np.float32)).dtype, np.float64)
+        self.assertIsNone(cam.projection._imageFromSpaceCompiled(p, cam.orientation.R, cam.orientation.t))
+
+    @unittest.skipIf(importlib.util.find_spec("numba") is None, "numba is not installed")
+    def test_compiledMap(self):
+        # a camera at the origin and a georeferenced camera with large coordinates
+        for pos_x_m, pos_y_m in [(0, 0), (5e5, 5e6)]:
+            cam = ct.Camera(ct.RectilinearProjection(focallength_px=3729, image=(460, 259)),
+                            ct.SpatialOrientation(elevation_m=15.4, tilt_deg=85, heading_deg=20, pos_x_m=pos_x_m, pos_y_m=pos_y_m))
+            extent = [pos_x_m - 10.03, pos_x_m + 10, pos_y_m - 30.03, pos_y_m + 60]
+            for Z, hide_backpoints in [(0, True), (5, True), (20, True), (20, False)]:
+                cam.projection.use_compiled_kernels = False
+                expected = cam._getMap(extent, 0.1, Z=Z, hide_backpoints=hide_backpoints).copy()
+                cam.map = None
+                cam.projection.use_compiled_kernels = True
+                compiled = cam._getMap(extent, 0.1, Z=Z, hide_backpoints=hide_backpoints).copy()
+                cam.map = None
+                self.assertEqual(compiled.dtype, expected.dtype)
+                np.testing.assert_array_equal(np.isnan(compiled), np.isnan(expected))
+                np.testing.assert_allclose(compiled, expected, rtol=1e-6)
+
+    def test_mapCache(self):
+        cam = ct.Camera(ct.RectilinearProjection(focallength_px=300, image=(460, 259)),
+                        ct.SpatialOrientation(elevation_m=15.4, tilt_deg=85, heading_deg=20))
+        extent = [-10, 10, -30, 60]
+        map0 = cam._getMap(extent, 0.5, Z=0).copy()
+        # the same arguments return the cached map
+        self.assertIs(cam._getMap(extent, 0.5, Z=0), cam._getMap(extent, 0.5, Z=0))
+        # a different height has to calculate a new map
+        map5 = cam._getMap(extent, 0.5, Z=5).copy()
+        self.assertFalse(np.allclose(map0, map5, equal_nan=True))
+        np.testing.assert_equal(cam._getMap(extent, 0.5, Z=0), map0)
+        # showing the points behind the camera has to calculate a new map
+        map0_back = cam._getMap(extent, 0.5, Z=0, hide_backpoints=False)
+        self.assertTrue(np.any(np.isnan(map0)))
+        self.assertFalse(np.any(np.isnan(map0_back)))
+        # the top view uses the map of its arguments
+        image = np.arange(259 * 460, dtype=np.uint8).reshape(259, 460)
+        top0 = cam.getTopViewOfImage(image, extent, 0.5, Z=0)
+        top5 = cam.getTopViewOfImage(image, extent, 0.5, Z=5)
+        self.assertFalse(np.array_equal(top0, top5))
+
     @given(ct_st.camera_image_points(), st.floats(1, 100))
     def test_rays(self, params, factor):
         cam, p = params
@@ -213,6 +276,30 @@ class TestTransforms(unittest.TestCase):
             np.testing.assert_almost_equal(p, p2, 1, err_msg="Transforming from camera to world and back doesn't return "
                                                          "the original point.")
 
+    @given(ct_st.camera())
+    def test_integerImagePoints(self, cam):
+        p = np.array([[1, 2], [100, 50], [200, 150]])
+        offset, rays = cam.getRay(p.astype(float), normed=True)
+        space = cam.spaceFromImage(p.astype(float))
+        # integer and unsigned integer points give the same rays as floating point numbers
+        for dtype in [np.int32, np.int64, np.uint8, np.uint16]:
+            np.testing.assert_almost_equal(cam.getRay(p.astype(dtype), normed=True)[1], rays)
+            np.testing.assert_almost_equal(cam.spaceFromImage(p.astype(dtype)), space)
+
+    def test_spaceFromImageDistance(self):
+        cam = ct.Camera(ct.RectilinearProjection(focallength_px=3729, image=(4608, 2592)),
+                        ct.SpatialOrientation(elevation_m=15.4, tilt_deg=85))
+        p = np.array([[1968, 2291], [1650, 2189], [3000, 100]])
+        offset, rays = cam.getRay(p, normed=True)
+        # a scalar distance, a 0-d array, a list of distances and an array of distances
+        for D in [10, np.array(10), [10, 20, 30], np.array([10, 20, 30])]:
+            np.testing.assert_almost_equal(cam.spaceFromImage(p, D=D), offset + rays * np.asarray(D)[..., None])
+            np.testing.assert_almost_equal(np.linalg.norm(cam.spaceFromImage(p, D=D) - offset, axis=-1), np.broadcast_to(D, 3))
+        # a single point
+        np.testing.assert_almost_equal(cam.spaceFromImage(p[0], D=10), offset + rays[0] * 10)
+        # negative distances are behind the camera
+        self.assertTrue(np.all(np.isnan(cam.spaceFromImage(p, D=[10, -1, 30])[1])))
+
     @given(ct_st.projection(), ct_st.projection(), ct_st.orientation(), ct_st.orientation())
     def test_cameraGroup(self, proj1, proj2, orientation1, orientation2):
         def length(obj):